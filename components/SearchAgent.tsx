@@ -59,23 +59,24 @@ export const SearchAgent: React.FC<SearchAgentProps> = ({ onSuggestionSelect })
         }
 
         // Create new abort controller for this request
-        abortControllerRef.current = new AbortController();
+        const controller = new AbortController();
+        abortControllerRef.current = controller;
         
         setPending(false);
         setLoading(true);
         try {
-            const res = await getSearchSuggestions(searchQuery.trim());
+            const res = await getSearchSuggestions(searchQuery.trim(), controller.signal);
             // Only update if this request wasn't aborted
-            if (!abortControllerRef.current.signal.aborted) {
+            if (!controller.signal.aborted) {
                 setSuggestions(res);
             }
         } catch (e) {
-            if (!abortControllerRef.current?.signal.aborted) {
+            if (!controller.signal.aborted) {
                 console.error('Suggestion error', e);
                 setSuggestions([]);
             }
         } finally {
-            if (!abortControllerRef.current?.signal.aborted) {
+            if (!controller.signal.aborted) {
                 setLoading(false);
             }
         }
@@ -89,6 +90,13 @@ export const SearchAgent: React.FC<SearchAgentProps> = ({ onSuggestionSelect })
             clearTimeout(debounceTimerRef.current);
         }
 
+        // A new keystroke supersedes any search still in flight. The aborted
+        // search skips its own loading reset, so clear it here.
+        if (abortControllerRef.current) {
+            abortControllerRef.current.abort();
+            setLoading(false);
+        }
+
         // Clear suggestions if empty query
         if (!val.trim()) {
             setSuggestions([]);
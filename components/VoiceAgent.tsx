@@ -7,6 +7,27 @@ interface VoiceAgentProps {
   onConnectionChange?: (connected: boolean) => void;
 }
 
+// Local LiveKit configuration
+const LIVEKIT_URL = 'ws://localhost:7880';
+
+// Generate a proper JWT token for local development
+const generateLocalToken = async (roomName: string, participantName: string) => {
+  // Use dev credentials from local LiveKit server
+  const token = new AccessToken('devkey', 'secret', {
+    identity: participantName,
+    ttl: '1h',
+  });
+
+  token.addGrant({
+    room: roomName,
+    roomJoin: true,
+    canPublish: true,
+    canSubscribe: true,
+  });
+
+  return await token.toJwt();
+};
+
 export const VoiceAgent: React.FC<VoiceAgentProps> = ({ 
   context, 
   onConnectionChange 
@@ -17,27 +38,6 @@ export const VoiceAgent: React.FC<VoiceAgentProps> = ({
   const roomRef = useRef<Room | null>(null);
   const audioElementRef = useRef<HTMLAudioElement | null>(null);
 
-  // Local LiveKit configuration
-  const LIVEKIT_URL = 'ws://localhost:7880';
-  
-  // Generate a proper JWT token for local development
-  const generateLocalToken = async (roomName: string, participantName: string) => {
-    // Use dev credentials from local LiveKit server
-    const token = new AccessToken('devkey', 'secret', {
-      identity: participantName,
-      ttl: '1h',
-    });
-
-    token.addGrant({
-      room: roomName,
-      roomJoin: true,
-      canPublish: true,
-      canSubscribe: true,
-    });
-
-    return await token.toJwt();
-  };
-
   const connectToAgent = async () => {
     setIsConnecting(true);
     
@@ -1,16 +1,7 @@
-import { GoogleGenAI, Type } from "@google/genai";
-import { historicalPlaceSchema } from "./geminiService";
+import { Type } from "@google/genai";
+import { ai, GEMINI_TIMEOUT_MS, historicalPlaceSchema } from "./geminiService";
 import type { HistoricalPlace } from "../types";
 
-// API keys
-const apiKey = process.env.GEMINI_API_KEY;
-
-if (!apiKey) {
-  throw new Error("GEMINI_API_KEY environment variable not set.");
-}
-
-const ai = new GoogleGenAI({ apiKey });
-
 // Schema for an array of suggestions each with text and a HistoricalPlace payload
 const suggestionItemSchema = {
   type: Type.OBJECT,
@@ -35,6 +26,29 @@ const suggestionsResponseSchema = {
   required: ["suggestions"],
 };
 
+// Fixed instructions, with the place schema serialized once at module load
+// rather than per search. Sent as the system instruction so the user's query
+// is the only request content and never mixes into the instruction text.
+const SUGGESTIONS_SYSTEM_INSTRUCTION = `You are a search suggestions agent for an immersive learning app, "Know the Past".
+
+Return 3–7 high-quality suggestion items for the user's query. Each item must include:
+- suggestion: a concise, clickable text (<= 8 words) that refines the user's query
+- historicalPlaceSchema: a fully populated place object following THIS schema:
+  ${JSON.stringify(historicalPlaceSchema)}
+
+CRITICAL RULES:
+1) Always provide a valid Google Place ID (placeId) for the location.
+2) locationType is either 'point' (single site/monument) or 'area' (city/park/region). Use the right type.
+3) Include latitude, longitude, zoom_level (15–22 for points; for areas choose a reasonable overview if needed).
+4) details: 2–4 tailored facts with labels and icons from ['calendar','globe','geology','architecture','growth','time','sparkles'].
+   Always include one 'globe' detail showing the country.
+5) Avoid overused examples (e.g., Giza pyramids, Great Wall, Eiffel Tower) unless explicitly in the query.
+6) If the query is an event (e.g., a battle, discovery, or period), choose a representative physical location tied to that event (battlefield, city center, excavation site, museum, etc.).
+7) Suggestions should mix places and event-linked places where relevant, with geographic diversity.
+
+
+Return strictly as JSON matching the response schema.`;
+
 export type SuggestionItem = {
   suggestion: string;
   historicalPlaceSchema: HistoricalPlace; // named as requested
@@ -55,26 +69,7 @@ const searchSuggestionsCore = async (
   const trimmed = (searchText || "").trim();
   if (!trimmed) return [];
 
-  const prompt = `You are a search suggestions agent for an immersive learning app, "Know the Past".
-User typed: "${trimmed}".
-
-Return 3–7 high-quality suggestion items. Each item must include:
-- suggestion: a concise, clickable text (<= 8 words) that refines the user's query
-- historicalPlaceSchema: a fully populated place object following THIS schema:
-  ${JSON.stringify(historicalPlaceSchema)}
-
-CRITICAL RULES:
-1) Always provide a valid Google Place ID (placeId) for the location.
-2) locationType is either 'point' (single site/monument) or 'area' (city/park/region). Use the right type.
-3) Include latitude, longitude, zoom_level (15–22 for points; for areas choose a reasonable overview if needed).
-4) details: 2–4 tailored facts with labels and icons from ['calendar','globe','geology','architecture','growth','time','sparkles'].
-   Always include one 'globe' detail showing the country.
-5) Avoid overused examples (e.g., Giza pyramids, Great Wall, Eiffel Tower) unless explicitly in the query.
-6) If the query is an event (e.g., a battle, discovery, or period), choose a representative physical location tied to that event (battlefield, city center, excavation site, museum, etc.).
-7) Suggestions should mix places and event-linked places where relevant, with geographic diversity.
-
-
-Return strictly as JSON matching the response schema.`;
+  const prompt = `User typed: "${trimmed}".`;
 
   try {
     // Use direct Gemini API with structured output (working approach)
@@ -82,12 +77,14 @@ Return strictly as JSON matching the response schema.`;
       model: "gemini-2.5-flash",
       contents: prompt,
       config: {
+        systemInstruction: SUGGESTIONS_SYSTEM_INSTRUCTION,
+        httpOptions: { timeout: GEMINI_TIMEOUT_MS },
         responseMimeType: "application/json",
         responseSchema: suggestionsResponseSchema,
       },
     });
 
-    const jsonText = response.text.trim();
+    const jsonText = response.text;
     const data = JSON.parse(jsonText) as { suggestions: SuggestionItem[] };
     postProcessCategories(data);
     return data.suggestions;
@@ -97,10 +94,59 @@ Return strictly as JSON matching the response schema.`;
   }
 };
 
+// Exact-match LRU cache keyed on the normalized query. Pending promises are
+// stored too, so identical searches issued concurrently share one request.
+const SUGGESTION_CACHE_SIZE = 512;
+const suggestionCache = new Map<string, Promise<SuggestionItem[]>>();
+
+const suggestionCacheKey = (searchText: string) =>
+  (searchText || "").trim().toLowerCase().replace(/\s+/g, " ");
+
+// Resolves with `promise` unless `signal` aborts first. The underlying request
+// keeps running so a later search for the same query is served from the cache.
+const abortable = <T>(promise: Promise<T>, signal?: AbortSignal): Promise<T> => {
+  if (!signal) return promise;
+  if (signal.aborted) return Promise.reject(signal.reason);
+  return new Promise<T>((resolve, reject) => {
+    const onAbort = () => reject(signal.reason);
+    signal.addEventListener("abort", onAbort, { once: true });
+    promise
+      .then(resolve, reject)
+      .finally(() => signal.removeEventListener("abort", onAbort));
+  });
+};
+
+/**
+ * getSearchSuggestions
+ * Pass `signal` to stop waiting when a newer search supersedes this one; the
+ * returned promise then rejects with the signal's abort reason.
+ */
 export async function getSearchSuggestions(
-  searchText: string
+  searchText: string,
+  signal?: AbortSignal
 ): Promise<SuggestionItem[]> {
-  return await searchSuggestionsCore(searchText);
+  const key = suggestionCacheKey(searchText);
+  if (!key) return [];
+
+  const cached = suggestionCache.get(key);
+  if (cached) {
+    // Re-insert to mark as most recently used (Map keeps insertion order)
+    suggestionCache.delete(key);
+    suggestionCache.set(key, cached);
+    return await abortable(cached, signal);
+  }
+
+  const pending = searchSuggestionsCore(searchText);
+  // Don't keep failures around; the next search should retry
+  pending.catch(() => {
+    if (suggestionCache.get(key) === pending) suggestionCache.delete(key);
+  });
+  suggestionCache.set(key, pending);
+  if (suggestionCache.size > SUGGESTION_CACHE_SIZE) {
+    suggestionCache.delete(suggestionCache.keys().next().value as string);
+  }
+
+  return await abortable(pending, signal);
 }
 
 function postProcessCategories(data: { suggestions: SuggestionItem[] }) {
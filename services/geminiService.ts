@@ -6,7 +6,12 @@ const apiKey = process.env.GEMINI_API_KEY;
 if (!apiKey) {
   throw new Error("API_KEY environment variable not set.");
 }
-const ai = new GoogleGenAI({ apiKey });
+// Single client (and API key check) shared by every service module.
+export const ai = new GoogleGenAI({ apiKey });
+
+// Timeouts (ms) so a stalled Gemini call fails instead of hanging the UI.
+export const GEMINI_TIMEOUT_MS = 30_000;
+const IMAGE_TIMEOUT_MS = 60_000;
 
 export const historicalPlaceSchema = {
   type: Type.OBJECT,
@@ -109,37 +114,24 @@ const visualSlidesSchema = {
   required: ["slides"],
 };
 
-export const fetchHistoricalPlace = async (
-  category: string
-): Promise<HistoricalPlace> => {
-  let categorySpecificInstructions = "";
-  switch (category) {
-    case "ancient":
-      categorySpecificInstructions =
-        "For 'Ancient', focus on diverse civilizations. Find a significant monument or site from ancient Greece, the Roman Empire, Feudal Japan, the Mauryan Empire in India, or Mesoamerican cultures like the Maya or Aztec in Mexico. Think beyond the most famous examples.";
-      break;
-    case "nature":
-      categorySpecificInstructions =
-        "For 'Nature', find a breathtakingly scenic natural wonder. This could be a unique geological formation, a stunning fjord, a vibrant coral reef, or a vast, remote desert. Focus on visual impact and geological uniqueness.";
-      break;
-    case "growth":
-      categorySpecificInstructions =
-        "For 'Growth', focus on human expansion and commerce. Find a historically significant ancient port city that was a hub of global trade (e.g., on the Silk Road or maritime routes), the capital of a vast ancient empire, or a city that experienced a dramatic and historically important period of rapid development.";
-      break;
-    case "time":
-      categorySpecificInstructions =
-        "For 'Time', focus on transformation over centuries. Find a location that powerfully illustrates change. This could be a place visibly affected by climate change (like a receding glacier or a changing coastline), or a historic European city center where distinct architectural styles from different eras stand side-by-side, telling a story of its evolution.";
-      break;
-    default:
-      categorySpecificInstructions = `Find a globally significant location for the category '${category}'.`;
-  }
+// Category-specific guidance for fetchHistoricalPlace, built once at module load.
+const CATEGORY_INSTRUCTIONS: Record<string, string> = {
+  ancient:
+    "For 'Ancient', focus on diverse civilizations. Find a significant monument or site from ancient Greece, the Roman Empire, Feudal Japan, the Mauryan Empire in India, or Mesoamerican cultures like the Maya or Aztec in Mexico. Think beyond the most famous examples.",
+  nature:
+    "For 'Nature', find a breathtakingly scenic natural wonder. This could be a unique geological formation, a stunning fjord, a vibrant coral reef, or a vast, remote desert. Focus on visual impact and geological uniqueness.",
+  growth:
+    "For 'Growth', focus on human expansion and commerce. Find a historically significant ancient port city that was a hub of global trade (e.g., on the Silk Road or maritime routes), the capital of a vast ancient empire, or a city that experienced a dramatic and historically important period of rapid development.",
+  time:
+    "For 'Time', focus on transformation over centuries. Find a location that powerfully illustrates change. This could be a place visibly affected by climate change (like a receding glacier or a changing coastline), or a historic European city center where distinct architectural styles from different eras stand side-by-side, telling a story of its evolution.",
+};
 
-  const prompt = `You are a world-class historian, geographer, and storyteller. Your goal is to surprise and educate the user with unique, globally significant locations.
+// System instruction for fetchHistoricalPlace: persona, rules and example.
+// The request contents carry only the category line.
+const HISTORICAL_PLACE_SYSTEM_INSTRUCTION = `You are a world-class historian, geographer, and storyteller. Your goal is to surprise and educate the user with unique, globally significant locations.
     
 **CRITICAL INSTRUCTION: AVOID REPETITIVE OR OBVIOUS EXAMPLES** like the Pyramids of Giza, the Great Wall of China, or the Eiffel Tower. Seek out less common but equally fascinating places.
 
-Based on the category '${category}', find a location. ${categorySpecificInstructions}
-
 Your response must follow these rules precisely:
 1.  **Determine Location Type:** Is it a specific 'point' (a single monument) or a larger 'area' (a city, park, region)? Set 'locationType' accordingly.
 2.  **Provide Google Place ID:** You MUST provide the official Google Place ID for the location in the 'placeId' field. This is non-negotiable.
@@ -153,17 +145,28 @@ Example for category 'growth' (Venice - an 'area'):
 - placeId: 'ChIJi7b5IqxdFYwR3a0IuTEb_gU'
 - A detail could be { "label": "Maritime Republic", "value": "Dominated Mediterranean trade for centuries", "icon": "growth" }.`;
 
+export const fetchHistoricalPlace = async (
+  category: string
+): Promise<HistoricalPlace> => {
+  const categorySpecificInstructions =
+    CATEGORY_INSTRUCTIONS[category] ??
+    `Find a globally significant location for the category '${category}'.`;
+
+  const prompt = `Based on the category '${category}', find a location. ${categorySpecificInstructions}`;
+
   try {
     const response = await ai.models.generateContent({
       model: "gemini-2.5-flash",
       contents: prompt,
       config: {
+        systemInstruction: HISTORICAL_PLACE_SYSTEM_INSTRUCTION,
+        httpOptions: { timeout: GEMINI_TIMEOUT_MS },
         responseMimeType: "application/json",
         responseSchema: historicalPlaceSchema,
       },
     });
 
-    const jsonText = response.text.trim();
+    const jsonText = response.text;
     const data = JSON.parse(jsonText);
 
     data.category = category;
@@ -177,18 +180,9 @@ Example for category 'growth' (Venice - an 'area'):
   }
 };
 
-export const fetchVisualSlides = async (
-  place: HistoricalPlace
-): Promise<Slide[]> => {
-  const prompt = `You are an expert visual educator and historical content creator. Your task is to create engaging, visual-first educational slides about a historical place.
-
-ANALYZE the following place:
-- Name: ${place.name}
-- Category: ${place.category}
-- Description: ${place.description}
-- Details: ${JSON.stringify(place.details)}
-
-Based on this, determine what users would be most interested in seeing. Create 1-5 slides (you decide the optimal number) based on what's most compelling about this specific location.
+// Place-independent half of the visual slides prompt; the place itself is
+// described in the request contents (see buildVisualSlidesPrompt).
+const VISUAL_SLIDES_SYSTEM_INSTRUCTION = `You are an expert visual educator and historical content creator. Your task is to create engaging, visual-first educational slides about a historical place.
 
 AVAILABLE SLIDE TYPES:
 - "overview" - Stunning introduction to the place
@@ -220,40 +214,147 @@ DETAILED IMAGE PROMPT GUIDELINES:
 - Include cultural and geographical context
 - Mention specific visual elements that make this place unique`;
 
+const buildVisualSlidesPrompt = (place: HistoricalPlace): string => {
+  return `ANALYZE the following place:
+- Name: ${place.name}
+- Category: ${place.category}
+- Description: ${place.description}
+- Details: ${JSON.stringify(place.details)}
+
+Based on this, determine what users would be most interested in seeing. Create 1-5 slides (you decide the optimal number) based on what's most compelling about this specific location.`;
+};
+
+// Incrementally scans a streamed `{"slides": [...]}` payload. `push` returns
+// each slide object as soon as its closing brace has arrived; `isComplete`
+// reports whether the root object has closed, so truncation can be detected.
+const createSlideScanner = () => {
+  let buffer = "";
+  let pos = 0;
+  let depth = 0;
+  let inString = false;
+  let escaped = false;
+  let slideStart = -1;
+  let rootClosed = false;
+
+  const push = (chunk: string): Slide[] => {
+    buffer += chunk;
+    const completed: Slide[] = [];
+    for (; pos < buffer.length; pos++) {
+      const ch = buffer[pos];
+      if (inString) {
+        if (escaped) escaped = false;
+        else if (ch === "\\") escaped = true;
+        else if (ch === '"') inString = false;
+        continue;
+      }
+      if (rootClosed && !/\s/.test(ch)) {
+        throw new Error("Unexpected data after slides payload.");
+      }
+      if (ch === '"') {
+        inString = true;
+      } else if (ch === "{" || ch === "[") {
+        depth++;
+        // depth 1 is the root object, 2 the slides array, 3 a single slide
+        if (ch === "{" && depth === 3) slideStart = pos;
+      } else if (ch === "}" || ch === "]") {
+        if (depth === 0) throw new Error("Malformed slides payload.");
+        if (ch === "}" && depth === 3 && slideStart >= 0) {
+          completed.push(JSON.parse(buffer.slice(slideStart, pos + 1)));
+          slideStart = -1;
+        }
+        depth--;
+        if (depth === 0) rootClosed = ch === "}";
+      }
+    }
+    return completed;
+  };
+
+  return { push, isComplete: () => rootClosed && depth === 0 };
+};
+
+/**
+ * streamVisualSlides
+ * Yields each slide as soon as Gemini has finished emitting it, so callers can
+ * start rendering (and generating images) before the full response arrives.
+ * Aborting `signal`, or returning early from the loop, cancels the request.
+ */
+export async function* streamVisualSlides(
+  place: HistoricalPlace,
+  signal?: AbortSignal
+): AsyncGenerator<Slide> {
+  const controller = new AbortController();
+  const onAbort = () => controller.abort();
+  signal?.addEventListener("abort", onAbort, { once: true });
+  if (signal?.aborted) controller.abort();
+
+  // httpOptions.timeout would bound the whole stream, cutting off long slide
+  // generations; instead abort when no chunk arrives for GEMINI_TIMEOUT_MS.
+  let idleTimer: ReturnType<typeof setTimeout> | undefined;
+  const armIdleTimeout = () => {
+    clearTimeout(idleTimer);
+    idleTimer = setTimeout(() => controller.abort(), GEMINI_TIMEOUT_MS);
+  };
+  armIdleTimeout();
   try {
-    const response = await ai.models.generateContent({
+    const stream = await ai.models.generateContentStream({
       model: "gemini-2.5-flash",
-      contents: prompt,
+      contents: buildVisualSlidesPrompt(place),
       config: {
+        systemInstruction: VISUAL_SLIDES_SYSTEM_INSTRUCTION,
+        abortSignal: controller.signal,
         responseMimeType: "application/json",
         responseSchema: visualSlidesSchema,
       },
     });
-    const jsonText = response.text.trim();
-    const data = JSON.parse(jsonText);
-    return data.slides as Slide[];
+    const scanner = createSlideScanner();
+    for await (const chunk of stream) {
+      armIdleTimeout();
+      for (const slide of scanner.push(chunk.text ?? "")) {
+        yield slide;
+      }
+    }
+    if (!scanner.isComplete()) {
+      throw new Error("Slides response ended before the JSON payload closed.");
+    }
   } catch (error) {
+    // Cancelled by the caller; not an API failure
+    if (signal?.aborted) throw error;
     console.error("Error fetching visual slides from Gemini API:", error);
     throw new Error("Failed to generate visual content. Please try again.");
+  } finally {
+    clearTimeout(idleTimer);
+    signal?.removeEventListener("abort", onAbort);
+    // Stop downloading the body if the consumer stopped early
+    controller.abort();
   }
-};
+}
+
+export interface GeneratedImage {
+  base64: string;
+  mimeType: string;
+}
 
 export const generateImageFromPrompt = async (
   prompt: string
-): Promise<string> => {
+): Promise<GeneratedImage> => {
   try {
     const promptContent = [{ text: prompt }];
 
     const response = await ai.models.generateContent({
       model: "gemini-2.5-flash-image-preview",
       contents: promptContent,
+      config: {
+        httpOptions: { timeout: IMAGE_TIMEOUT_MS },
+      },
     });
     if (response.candidates && response.candidates.length > 0) {
       const content = response.candidates[0].content;
       for (const part of content.parts) {
         if (part.inlineData && part.inlineData.data) {
-          const base64ImageBytes: string = part.inlineData.data;
-          return base64ImageBytes;
+          return {
+            base64: part.inlineData.data,
+            mimeType: part.inlineData.mimeType || "image/png",
+          };
         }
       }
     }